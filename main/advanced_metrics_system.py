@@ -72,7 +72,7 @@ class MetricDefinition:
     retention_period: timedelta = field(default_factory=lambda: timedelta(days=30))
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricValue:
     """A single metric value."""
     metric_name: str
@@ -505,15 +505,19 @@ class AdvancedMetricsSystem:
         
         self.logger.info("Advanced metrics system stopped")
     
+    async def _collect_once(self):
+        """Run a single collection pass over all registered collectors."""
+        for collector in self.collectors:
+            metrics = await collector.collect_metrics()
+            for metric in metrics:
+                await self._store_metric(metric)
+    
     async def _collection_loop(self):
         """Background loop for collecting metrics."""
         while self.running:
             try:
                 # Collect metrics from all collectors
-                for collector in self.collectors:
-                    metrics = await collector.collect_metrics()
-                    for metric in metrics:
-                        await self._store_metric(metric)
+                await self._collect_once()
                 
                 # Sleep before next collection
                 await asyncio.sleep(self.config.get("collection_interval", 30))
@@ -900,73 +904,79 @@ class AdvancedMetricsSystem:
             self.logger.error(f"Error calculating overall health: {e}")
             return {"error": str(e)}
     
-    def export_metrics(self, format: str = "json", time_range: Optional[Tuple[datetime, datetime]] = None) -> str:
-        """Export metrics in specified format."""
-        try:
-            export_data = {
-                "export_timestamp": datetime.now().isoformat(),
-                "time_range": {
-                    "start": time_range[0].isoformat() if time_range else None,
-                    "end": time_range[1].isoformat() if time_range else None
-                },
-                "metrics": {},
-                "kpis": {},
-                "alerts": []
-            }
-            
-            # Export metrics
-            for metric_name, values in self.metric_values.items():
-                filtered_values = values
-                if time_range:
-                    filtered_values = [v for v in values if time_range[0] <= v.timestamp <= time_range[1]]
-                
-                export_data["metrics"][metric_name] = [
-                    {
-                        "value": v.value,
-                        "timestamp": v.timestamp.isoformat(),
-                        "tags": v.tags,
-                        "metadata": v.metadata
-                    }
-                    for v in filtered_values
-                ]
-            
-            # Export KPIs
-            for kpi_name, values in self.kpi_values.items():
-                filtered_values = values
-                if time_range:
-                    filtered_values = [v for v in values if time_range[0] <= v.timestamp <= time_range[1]]
-                
-                export_data["kpis"][kpi_name] = [
-                    {
-                        "value": v.value,
-                        "target_value": v.target_value,
-                        "achievement_percentage": v.achievement_percentage,
-                        "timestamp": v.timestamp.isoformat(),
-                        "trend": v.trend,
-                        "contributing_metrics": v.contributing_metrics
-                    }
-                    for v in filtered_values
-                ]
-            
-            # Export alerts
-            filtered_alerts = self.alerts
+    def _build_export_dict(self, time_range: Optional[Tuple[datetime, datetime]] = None) -> Dict[str, Any]:
+        """Build the export payload as plain Python objects."""
+        export_data = {
+            "export_timestamp": datetime.now().isoformat(),
+            "time_range": {
+                "start": time_range[0].isoformat() if time_range else None,
+                "end": time_range[1].isoformat() if time_range else None
+            },
+            "metrics": {},
+            "kpis": {},
+            "alerts": []
+        }
+        
+        # Export metrics
+        for metric_name, values in self.metric_values.items():
+            filtered_values = values
             if time_range:
-                filtered_alerts = [a for a in self.alerts if time_range[0] <= a.timestamp <= time_range[1]]
-            
-            export_data["alerts"] = [
+                filtered_values = [v for v in values if time_range[0] <= v.timestamp <= time_range[1]]
+        
+            export_data["metrics"][metric_name] = [
+                {
+                    "value": v.value,
+                    "timestamp": v.timestamp.isoformat(),
+                    "tags": v.tags,
+                    "metadata": v.metadata
+                }
+                for v in filtered_values
+            ]
+        
+        # Export KPIs
+        for kpi_name, values in self.kpi_values.items():
+            filtered_values = values
+            if time_range:
+                filtered_values = [v for v in values if time_range[0] <= v.timestamp <= time_range[1]]
+        
+            export_data["kpis"][kpi_name] = [
                 {
-                    "id": a.id,
-                    "metric_name": a.metric_name,
-                    "severity": a.severity.value,
-                    "message": a.message,
-                    "value": a.value,
-                    "threshold": a.threshold,
-                    "timestamp": a.timestamp.isoformat(),
-                    "acknowledged": a.acknowledged,
-                    "resolved": a.resolved
+                    "value": v.value,
+                    "target_value": v.target_value,
+                    "achievement_percentage": v.achievement_percentage,
+                    "timestamp": v.timestamp.isoformat(),
+                    "trend": v.trend,
+                    "contributing_metrics": v.contributing_metrics
                 }
-                for a in filtered_alerts
+                for v in filtered_values
             ]
+        
+        # Export alerts
+        filtered_alerts = self.alerts
+        if time_range:
+            filtered_alerts = [a for a in self.alerts if time_range[0] <= a.timestamp <= time_range[1]]
+        
+        export_data["alerts"] = [
+            {
+                "id": a.id,
+                "metric_name": a.metric_name,
+                "severity": a.severity.value,
+                "message": a.message,
+                "value": a.value,
+                "threshold": a.threshold,
+                "timestamp": a.timestamp.isoformat(),
+                "acknowledged": a.acknowledged,
+                "resolved": a.resolved
+            }
+            for a in filtered_alerts
+        ]
+        
+        return export_data
+        
+    def export_metrics(self, format: str = "json", time_range: Optional[Tuple[datetime, datetime]] = None) -> str:
+        """Export metrics in specified format."""
+        try:
+            export_data = self._build_export_dict(time_range)
             
             if format.lower() == "json":
                 return json.dumps(export_data, indent=2)
@@ -0,0 +1,43 @@
+"""Shared helpers for performance and load tests."""
+
+import asyncio
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timed(threshold_s: float):
+    """Assert that the wrapped block completes within ``threshold_s`` seconds.
+
+    Uses the monotonic ``time.perf_counter_ns`` clock so wall-clock jumps
+    cannot skew the measurement.
+    """
+    start = time.perf_counter_ns()
+    yield
+    elapsed_s = (time.perf_counter_ns() - start) / 1e9
+    assert elapsed_s < threshold_s, f"took {elapsed_s:.3f}s (limit {threshold_s}s)"
+
+
+def running_on_uvloop() -> bool:
+    """Return True when the running event loop is provided by uvloop."""
+    return type(asyncio.get_running_loop()).__module__.startswith("uvloop")
+
+
+class RecordingWS:
+    """Minimal websocket stand-in that records sent frames.
+
+    Cheaper than ``AsyncMock`` for load tests where the mock's call
+    bookkeeping would otherwise dominate the measurement. Use ``AsyncMock``
+    when a test needs side-effect injection.
+    """
+
+    __slots__ = ("sent",)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+    async def close(self, *args, **kwargs):
+        pass
@@ -0,0 +1,86 @@
+"""Shared pytest configuration for the Elite Coding Assistant test suite."""
+
+import asyncio
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--perf",
+        action="store_true",
+        default=False,
+        help="Run async tests on uvloop, apply the tighter performance thresholds "
+        "and keep the run in one process so pytest-benchmark stays enabled",
+    )
+    parser.addoption(
+        "--fake-redis",
+        action="store_true",
+        default=False,
+        help="Replace redis.asyncio.from_url with in-process fakeredis clients",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    # pytest-benchmark disables itself whenever xdist distributes tests, even
+    # with -n 0, so --perf runs are always kept in a single process
+    if config.getoption("--perf") and hasattr(config.option, "dist"):
+        config.option.numprocesses = None
+        config.option.dist = "no"
+        config.option.distload = False
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "perf: code-path performance test; only runs with --fake-redis so Redis latency is excluded",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--fake-redis"):
+        return
+    skip_perf = pytest.mark.skip(reason="performance tests need --fake-redis")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip_perf)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy(request):
+    """Run async tests on uvloop for ``--perf`` runs when it is available.
+    
+    pytest-asyncio builds its session loop from this policy; it replaces the
+    deprecated ``event_loop`` fixture override.
+    """
+    if request.config.getoption("--perf"):
+        try:
+            import uvloop
+        except ImportError:  # uvloop is unavailable on Windows
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+    return asyncio.get_event_loop_policy()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fake_redis(request):
+    """Route ``redis.asyncio.from_url`` to a shared fakeredis server under ``--fake-redis``."""
+    if not request.config.getoption("--fake-redis"):
+        yield None
+        return
+    
+    import fakeredis
+    import fakeredis.aioredis
+    import redis.asyncio
+    
+    server = fakeredis.FakeServer()
+    
+    def from_url(url, **kwargs):
+        return fakeredis.aioredis.FakeRedis.from_url(url, server=server, **kwargs)
+    
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(redis.asyncio, "from_url", from_url)
+    yield server
+    monkeypatch.undo()
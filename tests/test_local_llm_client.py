@@ -0,0 +1,309 @@
+"""Unit tests for LocalLLMClient request hedging, response caching and model list caching.
+
+The Ollama client is replaced with an in-process fake, so no Ollama server is needed.
+"""
+
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from utils.local_llm_client import LocalLLMClient
+
+
+MODEL_NAME = "openhermes:7b"
+
+
+def chat_reply(content: str) -> dict:
+    """Build a minimal Ollama chat response."""
+    return {
+        "message": {"role": "assistant", "content": content},
+        "eval_count": 3,
+        "eval_duration": 1_000_000,
+    }
+
+
+class FakeOllamaClient:
+    """Stand-in for ``ollama.AsyncClient`` that serves scripted replies.
+    
+    Each scripted chat result is a ``(delay, reply_or_exception)`` pair,
+    consumed in call order, where ``delay`` is seconds or an ``asyncio.Event``
+    to wait for; once the script runs out every call answers immediately. Cancelled chat calls are counted so tests can check that
+    losing hedged requests are torn down.
+    """
+    
+    def __init__(self, chat_script=(), list_script=()):
+        self.chat_script = list(chat_script)
+        self.list_script = list(list_script)
+        self.chat_calls = 0
+        self.cancelled_chats = 0
+        self.list_calls = 0
+    
+    async def chat(self, model, messages, options, stream=False):
+        self.chat_calls += 1
+        if self.chat_script:
+            delay, result = self.chat_script.pop(0)
+        else:
+            delay, result = 0, chat_reply(f"reply {self.chat_calls}")
+        
+        try:
+            if isinstance(delay, asyncio.Event):
+                await delay.wait()
+            else:
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled_chats += 1
+            raise
+        
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    async def list(self):
+        self.list_calls += 1
+        result = self.list_script.pop(0) if self.list_script else {"models": [{"name": MODEL_NAME}]}
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def fake_ollama():
+    """Provide the fake Ollama client used by ``llm_client``."""
+    return FakeOllamaClient()
+
+
+@pytest.fixture
+def llm_client(fake_ollama):
+    """Create a LocalLLMClient whose Ollama client is the fake."""
+    client = LocalLLMClient(SimpleNamespace(ollama_host="http://localhost:11434"))
+    client.client = fake_ollama
+    return client
+
+
+class TestHedgedRequests:
+    """Test racing slow deterministic requests against a duplicate."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("original_delay,duplicate_delay,winner", [
+        (10.0, 0.0, "duplicate"),
+        (0.05, 10.0, "original"),
+    ], ids=["duplicate_wins", "original_wins"])
+    async def test_first_success_wins(self, llm_client, fake_ollama, original_delay, duplicate_delay, winner):
+        """A slow request is duplicated after hedge_delay and the loser is cancelled."""
+        fake_ollama.chat_script = [
+            (original_delay, chat_reply("original")),
+            (duplicate_delay, chat_reply("duplicate")),
+        ]
+        
+        response = await llm_client.generate_response(
+            MODEL_NAME, "Hello", temperature=0, hedge_delay=0.01
+        )
+        
+        # The loser has finished unwinding by the time the winner is returned
+        assert response.content == winner
+        assert fake_ollama.chat_calls == 2
+        assert fake_ollama.cancelled_chats == 1
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failing_request", [0, 1], ids=["original_fails", "duplicate_fails"])
+    async def test_failed_sibling_in_same_round_is_retrieved(self, llm_client, fake_ollama, failing_request):
+        """A failure finishing in the same round as the winner is not reported as unretrieved."""
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        previous_handler = loop.get_exception_handler()
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+        
+        # Both requests wake on the same event, so they finish together; which
+        # one _hedged_chat inspects first follows set order, so either may fail
+        finished = asyncio.Event()
+        fake_ollama.chat_script = [
+            (finished, chat_reply("winner")),
+            (finished, chat_reply("winner")),
+        ]
+        fake_ollama.chat_script[failing_request] = (finished, ConnectionError("request failed"))
+        loop.call_later(0.03, finished.set)
+        
+        try:
+            response = await llm_client.generate_response(
+                MODEL_NAME, "Hello", temperature=0, hedge_delay=0.01
+            )
+            gc.collect()
+        finally:
+            loop.set_exception_handler(previous_handler)
+        
+        assert response.content == "winner"
+        assert fake_ollama.chat_calls == 2
+        assert unhandled == []
+    
+    @pytest.mark.asyncio
+    async def test_fast_request_is_not_duplicated(self, llm_client, fake_ollama):
+        """A request answering within hedge_delay is sent only once."""
+        response = await llm_client.generate_response(
+            MODEL_NAME, "Hello", temperature=0, hedge_delay=1.0
+        )
+        
+        assert response.content == "reply 1"
+        assert fake_ollama.chat_calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_raises_when_every_attempt_fails(self, llm_client, fake_ollama):
+        """The error is surfaced when both the original and the duplicate fail."""
+        fake_ollama.chat_script = [
+            (0.05, ConnectionError("original failed")),
+            (0.0, ConnectionError("duplicate failed")),
+        ]
+        
+        with pytest.raises(ConnectionError):
+            await llm_client.generate_response(
+                MODEL_NAME, "Hello", temperature=0, hedge_delay=0.01
+            )
+        
+        assert fake_ollama.chat_calls == 2
+        assert llm_client.performance_metrics[MODEL_NAME].failed_requests == 1
+
+
+class TestResponseCache:
+    """Test the LRU cache of deterministic responses."""
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_chat(self, llm_client, fake_ollama):
+        """A repeated deterministic request is answered from the cache."""
+        first = await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0)
+        second = await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0)
+        
+        assert fake_ollama.chat_calls == 1
+        assert second.content == first.content
+        assert second.metadata["cache_hit"] is True
+        assert "cache_hit" not in first.metadata
+    
+    @pytest.mark.asyncio
+    async def test_cache_hit_ignores_caller_changes(self, llm_client, fake_ollama):
+        """Changing a returned response does not change what later hits serve."""
+        first = await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0)
+        original_content = first.content
+        first.content = "tampered"
+        first.metadata["eval_count"] = -1
+        
+        second = await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0)
+        second.metadata["eval_count"] = -2
+        third = await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0)
+        
+        assert fake_ollama.chat_calls == 1
+        assert second.content == original_content
+        assert third.metadata["eval_count"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_non_deterministic_requests_are_not_cached(self, llm_client, fake_ollama):
+        """Requests with a non-zero temperature go to the model every time."""
+        await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0.7)
+        await llm_client.generate_response(MODEL_NAME, "Hello", temperature=0.7)
+        
+        assert fake_ollama.chat_calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_oldest_entry_is_evicted(self, llm_client, fake_ollama, monkeypatch):
+        """The least recently used response is dropped once the cache is full."""
+        monkeypatch.setattr(LocalLLMClient, "RESPONSE_CACHE_SIZE", 2)
+        
+        for prompt in ("first", "second", "third"):
+            await llm_client.generate_response(MODEL_NAME, prompt, temperature=0)
+        assert len(llm_client._response_cache) == 2
+        
+        # "third" is still cached; "first" was evicted and goes back to the model
+        await llm_client.generate_response(MODEL_NAME, "third", temperature=0)
+        assert fake_ollama.chat_calls == 3
+        await llm_client.generate_response(MODEL_NAME, "first", temperature=0)
+        assert fake_ollama.chat_calls == 4
+
+
+class TestModelListCache:
+    """Test the short-lived cache of installed model names."""
+    
+    @pytest.mark.asyncio
+    async def test_list_is_fetched_once_within_ttl(self, llm_client, fake_ollama):
+        """Concurrent and repeated lookups within MODEL_LIST_TTL share one list() call."""
+        results = await asyncio.gather(
+            *(llm_client._get_available_model_names() for _ in range(5))
+        )
+        await llm_client._get_available_model_names()
+        
+        assert fake_ollama.list_calls == 1
+        assert sorted(refreshed for _, refreshed in results) == [False] * 4 + [True]
+        assert all(names == {MODEL_NAME} for names, _ in results)
+    
+    @pytest.mark.asyncio
+    async def test_force_refresh_bypasses_cache(self, llm_client, fake_ollama):
+        """A forced lookup contacts Ollama even within MODEL_LIST_TTL."""
+        await llm_client._get_available_model_names()
+        _, refreshed = await llm_client._get_available_model_names(force_refresh=True)
+        
+        assert refreshed is True
+        assert fake_ollama.list_calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_list_is_refetched_after_ttl(self, llm_client, fake_ollama, monkeypatch):
+        """An expired model list is fetched again."""
+        monkeypatch.setattr(LocalLLMClient, "MODEL_LIST_TTL", 0.0)
+        
+        await llm_client._get_available_model_names()
+        await llm_client._get_available_model_names()
+        
+        assert fake_ollama.list_calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_failure_clears_cache(self, llm_client, fake_ollama, monkeypatch):
+        """A failed refresh drops the cached list instead of serving it stale."""
+        await llm_client._get_available_model_names()
+        assert llm_client._model_list_cache is not None
+        
+        monkeypatch.setattr(LocalLLMClient, "MODEL_LIST_TTL", 0.0)
+        fake_ollama.list_script = [ConnectionError("Ollama is down")]
+        with pytest.raises(ConnectionError):
+            await llm_client._get_available_model_names()
+        
+        assert llm_client._model_list_cache is None
+        assert fake_ollama.list_calls == 2
+
+
+class TestHealthCheck:
+    """Test that health checks only report checks that reached Ollama."""
+    
+    @pytest.mark.asyncio
+    async def test_cached_answer_keeps_last_check(self, llm_client, fake_ollama):
+        """A health check answered from the cache does not record a new check."""
+        first = await llm_client.health_check()
+        checked_at = llm_client.last_health_check
+        
+        fake_ollama.list_script = [ConnectionError("Ollama is down")]
+        second = await llm_client.health_check()
+        
+        assert fake_ollama.list_calls == 1
+        assert llm_client.last_health_check == checked_at
+        assert second["last_check"] == first["last_check"] == checked_at.isoformat()
+    
+    @pytest.mark.asyncio
+    async def test_forced_check_reports_failure(self, llm_client, fake_ollama):
+        """A forced health check contacts Ollama and reports it unreachable."""
+        await llm_client.health_check()
+        checked_at = llm_client.last_health_check
+        
+        fake_ollama.list_script = [ConnectionError("Ollama is down")]
+        health = await llm_client.health_check(force_refresh=True)
+        
+        assert fake_ollama.list_calls == 2
+        assert health["connected"] is False
+        assert llm_client.is_connected is False
+        assert llm_client.last_health_check == checked_at
+    
+    @pytest.mark.asyncio
+    async def test_connect_always_contacts_ollama(self, llm_client, fake_ollama):
+        """connect() verifies the connection even when the model list is cached."""
+        await llm_client.health_check()
+        
+        fake_ollama.list_script = [ConnectionError("Ollama is down")]
+        await llm_client.connect()
+        
+        assert fake_ollama.list_calls == 2
+        assert llm_client.is_connected is False
@@ -18,88 +18,83 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from main.coding_director import CodingDirector
+import argparse
+import asyncio
+import functools
 import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 
-def example_basic_usage():
-    """Demonstrate basic usage of the coding assistant."""
-    print("Example 1: Basic Usage")
-    print("=" * 30)
-    
-    # Initialize the director
-    director = CodingDirector()
-    
-    # Simple coding request
-    prompt = "Write a Python function to calculate the factorial of a number"
-    print(f"Request: {prompt}")
-    print("\nResponse:")
-    
-    response = director.get_assistance(prompt)
-    print(response)
-    print("\n" + "=" * 50 + "\n")
-
+FIND_DUPLICATES_CODE = '''
+def find_duplicates(arr):
+    duplicates = []
+    for i in range(len(arr)):
+        for j in range(i+1, len(arr)):
+            if arr[i] == arr[j] and arr[i] not in duplicates:
+                duplicates.append(arr[i])
+    return duplicates
+'''
 
-def example_mathematical_tasks():
-    """Demonstrate mathematical and algorithmic tasks."""
-    print("Example 2: Mathematical Tasks")
-    print("=" * 30)
-    
-    director = CodingDirector()
-    
-    math_prompts = [
-        "Calculate the derivative of f(x) = x^3 + 2x^2 - 5x + 1",
-        "Implement the quicksort algorithm and analyze its time complexity",
-        "Write a function to find the greatest common divisor using Euclidean algorithm"
-    ]
+BUGGY_BINARY_SEARCH_CODE = '''
+def binary_search(arr, target):
+    left = 0
+    right = len(arr)
     
-    for prompt in math_prompts:
-        print(f"Request: {prompt}")
-        print("Response:")
-        
-        start_time = time.time()
-        response = director.get_assistance(prompt)
-        response_time = time.time() - start_time
-        
-        # Show first 200 characters of response
-        print(response[:200] + "..." if len(response) > 200 else response)
-        print(f"[Response time: {response_time:.2f}s]")
-        print("-" * 40)
+    while left < right:
+        mid = (left + right) // 2
+        if arr[mid] == target:
+            return mid
+        elif arr[mid] < target:
+            left = mid
+        else:
+            right = mid
     
-    print("=" * 50 + "\n")
+    return -1
 
+# Test
+arr = [1, 3, 5, 7, 9, 11, 13]
+print(binary_search(arr, 7))  # Should return 3, but causes infinite loop
+'''
 
-def example_web_development():
-    """Demonstrate web development tasks."""
-    print("Example 3: Web Development")
-    print("=" * 30)
-    
-    director = CodingDirector()
-    
-    web_prompts = [
-        "Create a Flask REST API endpoint for user registration",
-        "Write a JavaScript function to validate email addresses",
-        "Design a responsive CSS layout for a blog homepage"
-    ]
-    
-    for prompt in web_prompts:
-        print(f"Request: {prompt}")
-        print("Response:")
-        
-        response = director.get_assistance(prompt)
-        print(response[:300] + "..." if len(response) > 300 else response)
-        print("-" * 40)
-    
-    print("=" * 50 + "\n")
 
+@dataclass(frozen=True)
+class Example:
+    """A titled group of prompts demonstrated against the coding assistant."""
+    title: str
+    prompts: List[str]
+    label: Optional[str] = None
+    preview_chars: Optional[int] = None
+    timed: bool = False
 
-def example_complex_architecture():
-    """Demonstrate complex architectural tasks."""
-    print("Example 4: Complex Architecture")
-    print("=" * 30)
-    
-    director = CodingDirector()
-    
-    complex_prompt = """
+
+EXAMPLES: Dict[str, Example] = {
+    "basic": Example(
+        title="Basic Usage",
+        prompts=["Write a Python function to calculate the factorial of a number"]
+    ),
+    "math": Example(
+        title="Mathematical Tasks",
+        prompts=[
+            "Calculate the derivative of f(x) = x^3 + 2x^2 - 5x + 1",
+            "Implement the quicksort algorithm and analyze its time complexity",
+            "Write a function to find the greatest common divisor using Euclidean algorithm"
+        ],
+        preview_chars=200,
+        timed=True
+    ),
+    "web": Example(
+        title="Web Development",
+        prompts=[
+            "Create a Flask REST API endpoint for user registration",
+            "Write a JavaScript function to validate email addresses",
+            "Design a responsive CSS layout for a blog homepage"
+        ],
+        preview_chars=300
+    ),
+    "architecture": Example(
+        title="Complex Architecture",
+        prompts=["""
     Design a microservices architecture for an e-commerce platform with the following requirements:
     - User authentication and authorization
     - Product catalog management
@@ -109,106 +104,128 @@ def example_complex_architecture():
     - Notification system
     
     Include service boundaries, communication patterns, and data storage considerations.
-    """
-    
-    print("Request: Complex e-commerce microservices architecture")
-    print("Response:")
-    
-    start_time = time.time()
-    response = director.get_assistance(complex_prompt)
-    response_time = time.time() - start_time
-    
-    print(response)
-    print(f"\n[Response time: {response_time:.2f}s]")
-    print("=" * 50 + "\n")
-
-
-def example_code_review():
-    """Demonstrate code review and optimization."""
-    print("Example 5: Code Review and Optimization")
-    print("=" * 30)
-    
-    director = CodingDirector()
-    
-    code_to_review = '''
-def find_duplicates(arr):
-    duplicates = []
-    for i in range(len(arr)):
-        for j in range(i+1, len(arr)):
-            if arr[i] == arr[j] and arr[i] not in duplicates:
-                duplicates.append(arr[i])
-    return duplicates
-'''
-    
-    prompt = f"""
+    """],
+        label="Complex e-commerce microservices architecture",
+        timed=True
+    ),
+    "review": Example(
+        title="Code Review and Optimization",
+        prompts=[f"""
     Review this Python code and suggest optimizations:
     
-    {code_to_review}
+    {FIND_DUPLICATES_CODE}
     
     Please provide:
     1. Analysis of current time complexity
     2. Potential issues or bugs
     3. Optimized version with better performance
     4. Explanation of improvements
-    """
+    """],
+        label="Code review and optimization"
+    ),
+    "debug": Example(
+        title="Debugging Help",
+        prompts=[f"""
+    This binary search implementation has a bug that causes an infinite loop. 
+    Can you identify the issue and provide a corrected version?
     
-    print("Request: Code review and optimization")
-    print("Response:")
+    {BUGGY_BINARY_SEARCH_CODE}
+    """],
+        label="Debug binary search infinite loop"
+    ),
+}
+
+EXAMPLE_NAMES = [*EXAMPLES, "metrics"]
+
+
+@functools.cache
+def get_director() -> CodingDirector:
+    """Return the process-wide CodingDirector, creating it on first use."""
+    return CodingDirector()
+
+
+def truncate(text: str, limit: Optional[int]) -> str:
+    """
+    Shorten text to a preview of at most limit characters.
     
-    response = director.get_assistance(prompt)
-    print(response)
-    print("=" * 50 + "\n")
+    Args:
+        text: Text to shorten
+        limit: Maximum number of characters to keep, or None for no limit
+        
+    Returns:
+        The text unchanged if it fits, otherwise its first limit characters followed by "..."
+    """
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:limit] + "..."
 
 
-def example_debugging_help():
-    """Demonstrate debugging assistance."""
-    print("Example 6: Debugging Help")
-    print("=" * 30)
+async def run_prompts(director: CodingDirector, prompts: List[str]) -> List[Tuple[str, float]]:
+    """
+    Send a group of independent prompts to the director concurrently.
     
-    director = CodingDirector()
+    Args:
+        director: Coding director to query
+        prompts: Prompts to send
+        
+    Returns:
+        (response, response_time) pairs in the same order as prompts
+    """
+    async def timed_assistance(prompt: str) -> Tuple[str, float]:
+        start_time = time.time()
+        response = await asyncio.to_thread(director.get_assistance, prompt)
+        return response, time.time() - start_time
     
-    buggy_code = '''
-def binary_search(arr, target):
-    left = 0
-    right = len(arr)
+    return await asyncio.gather(*(timed_assistance(prompt) for prompt in prompts))
+
+
+def run_example(
+    number: int,
+    example: Example,
+    max_prompts: Optional[int] = None,
+    dry_run: bool = False
+):
+    """
+    Run one example group against the shared director and print the results.
     
-    while left < right:
-        mid = (left + right) // 2
-        if arr[mid] == target:
-            return mid
-        elif arr[mid] < target:
-            left = mid
-        else:
-            right = mid
+    Args:
+        number: Position of the example in the printed sequence
+        example: Example group to run
+        max_prompts: Optional limit on how many of the group's prompts to send
+        dry_run: Print the prompts without sending them to the director
+    """
+    print(f"Example {number}: {example.title}")
+    print("=" * 30)
     
-    return -1
-
-# Test
-arr = [1, 3, 5, 7, 9, 11, 13]
-print(binary_search(arr, 7))  # Should return 3, but causes infinite loop
-'''
+    prompts = example.prompts[:max_prompts]
     
-    prompt = f"""
-    This binary search implementation has a bug that causes an infinite loop. 
-    Can you identify the issue and provide a corrected version?
+    if dry_run:
+        for prompt in prompts:
+            print(f"Request: {example.label or prompt}")
+            print("[dry run: request not sent]")
+        print("=" * 50 + "\n")
+        return
     
-    {buggy_code}
-    """
+    results = asyncio.run(run_prompts(get_director(), prompts))
     
-    print("Request: Debug binary search infinite loop")
-    print("Response:")
+    for prompt, (response, response_time) in zip(prompts, results):
+        print(f"Request: {example.label or prompt}")
+        print("Response:")
+        print(truncate(response, example.preview_chars))
+        if example.timed:
+            print(f"[Response time: {response_time:.2f}s]")
+        if len(prompts) > 1:
+            print("-" * 40)
     
-    response = director.get_assistance(prompt)
-    print(response)
     print("=" * 50 + "\n")
 
 
-def example_performance_metrics():
+def example_performance_metrics(number: int):
     """Show performance metrics after running examples."""
-    print("Example 7: Performance Metrics")
+    print(f"Example {number}: Performance Metrics")
     print("=" * 30)
     
-    director = CodingDirector()
+    director = get_director()
     
     # Run a few quick requests to generate metrics
     test_prompts = [
@@ -234,8 +251,48 @@ def example_performance_metrics():
     print("=" * 50 + "\n")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line options for selecting and trimming examples."""
+    parser = argparse.ArgumentParser(
+        description="Elite Coding Assistant - Usage Examples"
+    )
+    parser.add_argument(
+        '--only',
+        metavar='NAMES',
+        help=f'Comma-separated examples to run (choices: {", ".join(EXAMPLE_NAMES)})'
+    )
+    parser.add_argument(
+        '--max-prompts',
+        type=int,
+        metavar='N',
+        help='Send at most N prompts from each example'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print the prompts without contacting the assistant'
+    )
+    
+    args = parser.parse_args()
+    
+    if args.only:
+        args.only = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in args.only if name not in EXAMPLE_NAMES]
+        if unknown:
+            parser.error(f"unknown example(s): {', '.join(unknown)}")
+    else:
+        args.only = EXAMPLE_NAMES
+    
+    if args.max_prompts is not None and args.max_prompts < 1:
+        parser.error("--max-prompts must be at least 1")
+    
+    return args
+
+
 def main():
-    """Run all examples."""
+    """Run the selected examples."""
+    args = parse_args()
+    
     print("Elite Coding Assistant - Usage Examples")
     print("=" * 50)
     print("This script demonstrates various capabilities of the Elite Coding Assistant")
@@ -243,13 +300,14 @@ def main():
     print()
     
     try:
-        example_basic_usage()
-        example_mathematical_tasks()
-        example_web_development()
-        example_complex_architecture()
-        example_code_review()
-        example_debugging_help()
-        example_performance_metrics()
+        for number, name in enumerate(EXAMPLE_NAMES, start=1):
+            if name not in args.only:
+                continue
+            if name == "metrics":
+                if not args.dry_run:
+                    example_performance_metrics(number)
+                continue
+            run_example(number, EXAMPLES[name], args.max_prompts, args.dry_run)
         
         print("All examples completed successfully!")
         print("\nTo run the assistant interactively:")
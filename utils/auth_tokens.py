@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Enhanced Elite Coding Assistant - Auth Token Parsing
+===================================================
+
+Parsing for the ``user_id:session_id`` bearer tokens used by the
+real-time API and WebSocket handshake.
+"""
+
+from typing import Tuple
+
+
+class AuthError(ValueError):
+    """Raised when an auth token is malformed."""
+
+
+def parse_token(token: str) -> Tuple[str, str]:
+    """
+    Split an auth token into its user and session identifiers.
+    
+    Uses a single ``str.partition`` pass instead of ``split`` so no
+    intermediate list is built on every handshake.
+    
+    Args:
+        token: Token in ``user_id:session_id`` form
+        
+    Returns:
+        Tuple of (user_id, session_id)
+        
+    Raises:
+        AuthError: If either part is missing or the token has extra separators
+    """
+    user_id, sep, session_id = token.partition(":")
+    if not sep or not user_id or not session_id or ":" in session_id:
+        raise AuthError("Malformed auth token")
+    return user_id, session_id
@@ -13,18 +13,25 @@ Date: June 23, 2025
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union, AsyncGenerator
-from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple, Union, AsyncGenerator
+from dataclasses import dataclass, fields, replace
 from enum import Enum
+from functools import lru_cache
 import httpx
 import ollama
 from ollama import AsyncClient
 
-from .config_manager import EnhancedConfig
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps the client importable without the
+    # configuration package
+    from .config_manager import EnhancedConfig
 
 
 class ModelRole(Enum):
@@ -36,7 +43,7 @@ class ModelRole(Enum):
     PRINCIPAL_ARCHITECT = "principal_architect"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """Configuration for a specific model."""
     name: str
@@ -49,12 +56,18 @@ class ModelConfig:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
-        data['role'] = self.role.value
-        return data
+        return {
+            'name': self.name,
+            'role': self.role.value,
+            'timeout': self.timeout,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'context_window': self.context_window,
+            'enabled': self.enabled
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelResponse:
     """Response from a model interaction."""
     content: str
@@ -69,13 +82,26 @@ class ModelResponse:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
-        data['role'] = self.role.value
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        return {
+            'content': self.content,
+            'model_name': self.model_name,
+            'role': self.role.value,
+            'tokens_generated': self.tokens_generated,
+            'response_time_ms': self.response_time_ms,
+            'temperature': self.temperature,
+            'confidence_score': self.confidence_score,
+            'metadata': dict(self.metadata),
+            'timestamp': self.timestamp.isoformat()
+        }
+
 
+@lru_cache(maxsize=256)
+def _epoch_ns_to_iso(epoch_ns: int) -> str:
+    """Format an epoch timestamp in nanoseconds as a local ISO 8601 string."""
+    return datetime.fromtimestamp(epoch_ns / 1e9).isoformat()
 
-@dataclass
+
+@dataclass(slots=True)
 class ModelPerformanceMetrics:
     """Performance metrics for a model."""
     model_name: str
@@ -85,7 +111,14 @@ class ModelPerformanceMetrics:
     avg_response_time_ms: float = 0.0
     avg_tokens_per_second: float = 0.0
     avg_confidence_score: float = 0.0
-    last_used: Optional[datetime] = None
+    last_used_ns: Optional[int] = None  # wall-clock epoch nanoseconds
+    
+    @property
+    def last_used(self) -> Optional[datetime]:
+        """Time of the most recent request, or None if the model is unused."""
+        if self.last_used_ns is None:
+            return None
+        return datetime.fromtimestamp(self.last_used_ns / 1e9)
     
     @property
     def success_rate(self) -> float:
@@ -96,11 +129,60 @@ class ModelPerformanceMetrics:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
-        if self.last_used:
-            data['last_used'] = self.last_used.isoformat()
-        data['success_rate'] = self.success_rate
-        return data
+        return {
+            'model_name': self.model_name,
+            'total_requests': self.total_requests,
+            'successful_requests': self.successful_requests,
+            'failed_requests': self.failed_requests,
+            'avg_response_time_ms': self.avg_response_time_ms,
+            'avg_tokens_per_second': self.avg_tokens_per_second,
+            'avg_confidence_score': self.avg_confidence_score,
+            'last_used': _epoch_ns_to_iso(self.last_used_ns) if self.last_used_ns is not None else None,
+            'success_rate': self.success_rate
+        }
+
+
+# Built-in model line-up; per-model overrides come from the
+# ``<model family>_config`` attribute of the configuration object
+DEFAULT_MODEL_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "openhermes:7b": {
+        "role": ModelRole.ROUTER,
+        "timeout": 30,
+        "temperature": 0.3,
+        "max_tokens": 2048
+    },
+    "mathstral:7b": {
+        "role": ModelRole.QUANTITATIVE_SPECIALIST,
+        "timeout": 45,
+        "temperature": 0.2,
+        "max_tokens": 4096
+    },
+    "deepseek-coder-v2:16b-lite-instruct": {
+        "role": ModelRole.LEAD_DEVELOPER,
+        "timeout": 60,
+        "temperature": 0.4,
+        "max_tokens": 8192
+    },
+    "codellama:13b": {
+        "role": ModelRole.SENIOR_DEVELOPER,
+        "timeout": 45,
+        "temperature": 0.3,
+        "max_tokens": 4096
+    },
+    "wizardcoder:13b-python": {
+        "role": ModelRole.PRINCIPAL_ARCHITECT,
+        "timeout": 60,
+        "temperature": 0.5,
+        "max_tokens": 8192
+    }
+}
+
+_MODEL_CONFIG_ATTRS = {
+    model_name: f"{model_name.split(':')[0].replace('-', '_')}_config"
+    for model_name in DEFAULT_MODEL_CONFIGS
+}
+
+_MODEL_CONFIG_FIELDS = frozenset(field.name for field in fields(ModelConfig))
 
 
 class LocalLLMClient:
@@ -111,7 +193,10 @@ class LocalLLMClient:
     and robust error handling for the Enhanced Elite Coding Assistant.
     """
     
-    def __init__(self, config: EnhancedConfig):
+    RESPONSE_CACHE_SIZE = 1024
+    MODEL_LIST_TTL = 5.0  # seconds
+    
+    def __init__(self, config: "EnhancedConfig"):
         """
         Initialize the Local LLM Client.
         
@@ -121,17 +206,34 @@ class LocalLLMClient:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Initialize Ollama client
-        self.client = AsyncClient(host=config.ollama_host)
+        # Initialize Ollama client; one pooled connection set is shared by every
+        # request, and HTTP/2 multiplexing is used when Ollama is served over TLS
+        self.client = AsyncClient(
+            host=config.ollama_host,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=1000,
+                max_keepalive_connections=1000,
+                keepalive_expiry=30
+            )
+        )
         
         # Model configurations
         self.models: Dict[str, ModelConfig] = {}
         self.performance_metrics: Dict[str, ModelPerformanceMetrics] = {}
+        self._role_index: Dict[ModelRole, List[str]] = {}
+        
+        # Responses to deterministic requests, most recently used last
+        self._response_cache: "OrderedDict[str, ModelResponse]" = OrderedDict()
         
         # Connection status
         self.is_connected = False
         self.last_health_check = None
         
+        # Model names reported by Ollama, cached as (monotonic fetch time, names)
+        self._model_list_cache: Optional[Tuple[float, Set[str]]] = None
+        self._model_list_lock = asyncio.Lock()
+        
         # Load model configurations
         self._load_model_configs()
         
@@ -140,54 +242,17 @@ class LocalLLMClient:
     
     def _load_model_configs(self):
         """Load model configurations from config."""
-        model_configs = {
-            "openhermes:7b": ModelConfig(
-                name="openhermes:7b",
-                role=ModelRole.ROUTER,
-                timeout=30,
-                temperature=0.3,
-                max_tokens=2048
-            ),
-            "mathstral:7b": ModelConfig(
-                name="mathstral:7b",
-                role=ModelRole.QUANTITATIVE_SPECIALIST,
-                timeout=45,
-                temperature=0.2,
-                max_tokens=4096
-            ),
-            "deepseek-coder-v2:16b-lite-instruct": ModelConfig(
-                name="deepseek-coder-v2:16b-lite-instruct",
-                role=ModelRole.LEAD_DEVELOPER,
-                timeout=60,
-                temperature=0.4,
-                max_tokens=8192
-            ),
-            "codellama:13b": ModelConfig(
-                name="codellama:13b",
-                role=ModelRole.SENIOR_DEVELOPER,
-                timeout=45,
-                temperature=0.3,
-                max_tokens=4096
-            ),
-            "wizardcoder:13b-python": ModelConfig(
-                name="wizardcoder:13b-python",
-                role=ModelRole.PRINCIPAL_ARCHITECT,
-                timeout=60,
-                temperature=0.5,
-                max_tokens=8192
-            )
-        }
-        
-        # Override with config values if available
-        for model_name, model_config in model_configs.items():
-            config_key = model_name.split(':')[0].replace('-', '_')
-            if hasattr(self.config, f'{config_key}_config'):
-                config_data = getattr(self.config, f'{config_key}_config', {})
-                for key, value in config_data.items():
-                    if hasattr(model_config, key):
-                        setattr(model_config, key, value)
+        for model_name, defaults in DEFAULT_MODEL_CONFIGS.items():
+            model_config = ModelConfig(name=model_name, **defaults)
+            
+            # Override with config values if available
+            config_data = getattr(self.config, _MODEL_CONFIG_ATTRS[model_name], None)
+            if config_data:
+                for key in _MODEL_CONFIG_FIELDS & config_data.keys():
+                    setattr(model_config, key, config_data[key])
             
             self.models[model_name] = model_config
+            self._role_index.setdefault(model_config.role, []).append(model_name)
     
     def _initialize_performance_tracking(self):
         """Initialize performance tracking for all models."""
@@ -196,6 +261,64 @@ class LocalLLMClient:
                 model_name=model_name
             )
     
+    async def _get_available_model_names(
+        self,
+        force_refresh: bool = False
+    ) -> Tuple[Set[str], bool]:
+        """
+        Get the names of the models Ollama has installed.
+        
+        The list is cached for MODEL_LIST_TTL seconds, and concurrent callers
+        share a single refresh.
+        
+        Args:
+            force_refresh: Ask Ollama even when the cached list is still fresh
+        
+        Returns:
+            Tuple of (installed model names, whether Ollama was contacted)
+        """
+        async with self._model_list_lock:
+            if self._model_list_cache is not None and not force_refresh:
+                fetched_at, model_names = self._model_list_cache
+                if time.monotonic() - fetched_at < self.MODEL_LIST_TTL:
+                    return model_names, False
+            
+            try:
+                models = await self.client.list()
+            except Exception:
+                self._model_list_cache = None
+                raise
+            
+            model_names = {model['name'] for model in models['models']}
+            self._model_list_cache = (time.monotonic(), model_names)
+            return model_names, True
+    
+    async def _refresh_model_availability(
+        self,
+        force_refresh: bool = False
+    ) -> Tuple[Set[str], List[str]]:
+        """
+        Fetch the installed models and record a successful connection.
+        
+        The connection is only recorded when Ollama was actually contacted;
+        an answer from the model list cache leaves the last check untouched.
+        
+        Args:
+            force_refresh: Ask Ollama even when the cached list is still fresh
+        
+        Returns:
+            Tuple of (installed model names, configured models that are missing)
+        """
+        available_models, refreshed = await self._get_available_model_names(force_refresh)
+        if refreshed:
+            self.is_connected = True
+            self.last_health_check = datetime.now()
+        
+        missing_models = [
+            model_name for model_name in self.models if model_name not in available_models
+        ]
+        return available_models, missing_models
+    
     async def connect(self) -> bool:
         """
         Connect to Ollama and verify model availability.
@@ -205,20 +328,16 @@ class LocalLLMClient:
         """
         try:
             # Test connection
-            models = await self.client.list()
-            self.is_connected = True
-            self.last_health_check = datetime.now()
+            available_models, missing_models = await self._refresh_model_availability(
+                force_refresh=True
+            )
             
-            # Verify required models are available
-            available_models = {model['name'] for model in models['models']}
-            missing_models = []
+            # Enable exactly the required models that are available
+            for model_name, model_config in self.models.items():
+                model_config.enabled = model_name in available_models
             
-            for model_name in self.models.keys():
-                if model_name not in available_models:
-                    missing_models.append(model_name)
-                    self.models[model_name].enabled = False
-                else:
-                    self.models[model_name].enabled = True
+            if getattr(self.config, 'warmup_on_connect', False):
+                await self.warm_up_models()
             
             if missing_models:
                 self.logger.warning(f"Missing models: {missing_models}")
@@ -232,10 +351,39 @@ class LocalLLMClient:
             self.is_connected = False
             return False
     
-    async def health_check(self) -> Dict[str, Any]:
+    async def warm_up_models(self) -> Dict[str, bool]:
+        """
+        Load every enabled model into memory ahead of the first real request.
+        
+        Ollama loads a model without generating anything when it receives an
+        empty prompt; all models are loaded concurrently.
+        
+        Returns:
+            Dictionary mapping model name to whether it loaded successfully
+        """
+        model_names = [name for name, model in self.models.items() if model.enabled]
+        results = await asyncio.gather(
+            *(self.client.generate(model=name, prompt="") for name in model_names),
+            return_exceptions=True
+        )
+        
+        warmed = {}
+        for model_name, result in zip(model_names, results):
+            warmed[model_name] = not isinstance(result, Exception)
+            if not warmed[model_name]:
+                self.logger.warning(f"Failed to warm up {model_name}: {result}")
+        return warmed
+    
+    async def health_check(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Perform health check on Ollama connection and models.
         
+        Within MODEL_LIST_TTL of the last check the cached model list is
+        reported; ``last_check`` is the time Ollama was last actually contacted.
+        
+        Args:
+            force_refresh: Contact Ollama even when the cached model list is fresh
+        
         Returns:
             Dict containing health status information
         """
@@ -243,33 +391,33 @@ class LocalLLMClient:
             "connected": False,
             "models_available": 0,
             "models_enabled": 0,
-            "last_check": datetime.now().isoformat(),
+            "last_check": None,
             "issues": []
         }
         
         try:
             # Check connection
-            models = await self.client.list()
-            health_status["connected"] = True
+            available_models, missing_models = await self._refresh_model_availability(
+                force_refresh
+            )
+            health_status["connected"] = self.is_connected
             
             # Check model availability
-            available_models = {model['name'] for model in models['models']}
-            
-            for model_name, model_config in self.models.items():
-                if model_name in available_models:
-                    health_status["models_available"] += 1
-                    if model_config.enabled:
-                        health_status["models_enabled"] += 1
-                else:
-                    health_status["issues"].append(f"Model {model_name} not available")
-            
-            self.is_connected = True
-            self.last_health_check = datetime.now()
+            installed_models = available_models & self.models.keys()
+            health_status["models_available"] = len(installed_models)
+            health_status["models_enabled"] = sum(
+                1 for model_name in installed_models if self.models[model_name].enabled
+            )
+            health_status["issues"].extend(
+                f"Model {model_name} not available" for model_name in missing_models
+            )
             
         except Exception as e:
             health_status["issues"].append(f"Connection error: {str(e)}")
             self.is_connected = False
         
+        if self.last_health_check is not None:
+            health_status["last_check"] = self.last_health_check.isoformat()
         return health_status
     
     async def generate_response(
@@ -279,11 +427,16 @@ class LocalLLMClient:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        cache: bool = False,
+        hedge_delay: Optional[float] = None
     ) -> Union[ModelResponse, AsyncGenerator[str, None]]:
         """
         Generate response from specified model.
         
+        Non-streaming responses are served from an LRU cache when the request
+        is deterministic (temperature 0) or when ``cache`` is set.
+        
         Args:
             model_name: Name of the model to use
             prompt: User prompt
@@ -291,6 +444,9 @@ class LocalLLMClient:
             temperature: Optional temperature override
             max_tokens: Optional max tokens override
             stream: Whether to stream the response
+            cache: Cache the response even when temperature is not 0
+            hedge_delay: Seconds after which a slow deterministic (temperature 0)
+                request is raced against a duplicate; the first answer wins
             
         Returns:
             ModelResponse object or async generator for streaming
@@ -308,20 +464,43 @@ class LocalLLMClient:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        # Read the model defaults at call time; models[...] may be updated in place
         options = {
-            "temperature": temperature or model_config.temperature,
-            "num_predict": max_tokens or model_config.max_tokens,
+            "temperature": model_config.temperature if temperature is None else temperature,
+            "num_predict": model_config.max_tokens if max_tokens is None else max_tokens,
         }
         
-        start_time = time.time()
+        cache_key = None
+        if not stream and (cache or options["temperature"] == 0):
+            cache_key = self._response_cache_key(model_name, messages, options)
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                self._response_cache.move_to_end(cache_key)
+                return replace(
+                    cached_response,
+                    response_time_ms=0.0,
+                    metadata={**cached_response.metadata, "cache_hit": True},
+                    timestamp=datetime.now()
+                )
+        
+        start_ns = time.perf_counter_ns()
         
         try:
             if stream:
-                return self._stream_response(model_name, messages, options, start_time)
+                return self._stream_response(model_name, messages, options, start_ns)
             else:
-                return await self._generate_complete_response(
-                    model_name, messages, options, start_time
+                model_response = await self._generate_complete_response(
+                    model_name, messages, options, start_ns,
+                    hedge_delay=hedge_delay if options["temperature"] == 0 else None
                 )
+                if cache_key is not None:
+                    # Cache a private copy so callers can't alter later hits
+                    self._response_cache[cache_key] = replace(
+                        model_response, metadata=dict(model_response.metadata)
+                    )
+                    if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+                return model_response
                 
         except Exception as e:
             # Update performance metrics for failed request
@@ -329,30 +508,47 @@ class LocalLLMClient:
             self.logger.error(f"Error generating response from {model_name}: {e}")
             raise
     
+    @staticmethod
+    def _response_cache_key(
+        model_name: str,
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any]
+    ) -> str:
+        """Build a compact content hash identifying a chat request."""
+        payload = json.dumps([model_name, messages, options], sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
     async def _generate_complete_response(
         self,
         model_name: str,
         messages: List[Dict[str, str]],
         options: Dict[str, Any],
-        start_time: float
+        start_ns: int,
+        hedge_delay: Optional[float] = None
     ) -> ModelResponse:
         """Generate complete response (non-streaming)."""
         
-        response = await self.client.chat(
-            model=model_name,
-            messages=messages,
-            options=options
-        )
+        if hedge_delay is not None:
+            response = await self._hedged_chat(model_name, messages, options, hedge_delay)
+        else:
+            response = await self.client.chat(
+                model=model_name,
+                messages=messages,
+                options=options
+            )
         
-        end_time = time.time()
-        response_time_ms = (end_time - start_time) * 1000
+        response_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
         
         # Extract response content
-        content = response['message']['content']
+        message = response.get('message') or {}
+        content = message.get('content', '')
         
-        # Calculate metrics
-        tokens_generated = len(content.split())  # Rough token count
-        confidence_score = self._calculate_confidence_score(response)
+        # Calculate metrics; Ollama reports the exact generated token count
+        eval_count = response.get("eval_count", 0)
+        tokens_generated = eval_count or len(content.split())
+        eval_duration = response.get("eval_duration", 0)
+        tokens_per_second = eval_count / (eval_duration / 1e9) if eval_duration > 0 else None
+        confidence_score = self._calculate_confidence_score(len(content), tokens_per_second)
         
         # Create response object
         model_response = ModelResponse(
@@ -364,8 +560,8 @@ class LocalLLMClient:
             temperature=options.get("temperature", 0.3),
             confidence_score=confidence_score,
             metadata={
-                "eval_count": response.get("eval_count", 0),
-                "eval_duration": response.get("eval_duration", 0),
+                "eval_count": eval_count,
+                "eval_duration": eval_duration,
                 "load_duration": response.get("load_duration", 0),
                 "prompt_eval_count": response.get("prompt_eval_count", 0),
                 "prompt_eval_duration": response.get("prompt_eval_duration", 0),
@@ -385,16 +581,63 @@ class LocalLLMClient:
         
         return model_response
     
+    async def _hedged_chat(
+        self,
+        model_name: str,
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any],
+        hedge_delay: float
+    ) -> Dict[str, Any]:
+        """
+        Run a chat request, racing a duplicate if it is slow to answer.
+        
+        Args:
+            model_name: Name of the model to use
+            messages: Chat messages to send
+            options: Ollama generation options
+            hedge_delay: Seconds to wait before sending the duplicate request
+            
+        Returns:
+            Raw response of whichever request succeeds first
+        """
+        def start_chat() -> asyncio.Task:
+            return asyncio.create_task(
+                self.client.chat(model=model_name, messages=messages, options=options)
+            )
+        
+        tasks = [start_chat()]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                tasks.append(start_chat())
+                pending.add(tasks[-1])
+            
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    # Every request failed; surface the last error
+                    return done.pop().result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled losers finish unwinding; gathering also retrieves
+            # the error of a sibling that failed in the same round as the winner
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def _stream_response(
         self,
         model_name: str,
         messages: List[Dict[str, str]],
         options: Dict[str, Any],
-        start_time: float
+        start_ns: int
     ) -> AsyncGenerator[str, None]:
         """Generate streaming response."""
         
-        full_content = ""
+        content_chunks: List[str] = []
+        eval_count = 0
         
         async for chunk in await self.client.chat(
             model=model_name,
@@ -402,15 +645,16 @@ class LocalLLMClient:
             options=options,
             stream=True
         ):
-            if chunk['message']['content']:
-                content_chunk = chunk['message']['content']
-                full_content += content_chunk
+            content_chunk = chunk['message']['content']
+            if content_chunk:
+                content_chunks.append(content_chunk)
                 yield content_chunk
+            # Only the final chunk carries the generated token count
+            eval_count = chunk.get('eval_count', eval_count)
         
         # Update metrics after streaming is complete
-        end_time = time.time()
-        response_time_ms = (end_time - start_time) * 1000
-        tokens_generated = len(full_content.split())
+        response_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        tokens_generated = eval_count or len("".join(content_chunks).split())
         
         self._update_performance_metrics(
             model_name,
@@ -420,36 +664,29 @@ class LocalLLMClient:
             confidence_score=0.8  # Default for streaming
         )
     
-    def _calculate_confidence_score(self, response: Dict[str, Any]) -> float:
+    def _calculate_confidence_score(
+        self,
+        content_length: int,
+        tokens_per_second: Optional[float]
+    ) -> float:
         """
         Calculate confidence score based on response metadata.
         
         Args:
-            response: Raw response from Ollama
+            content_length: Length of the response content in characters
+            tokens_per_second: Generation speed reported by Ollama, or None if unknown
             
         Returns:
             Confidence score between 0.0 and 1.0
         """
-        # Basic confidence calculation based on response characteristics
-        base_confidence = 0.7
-        
-        # Adjust based on response length
-        content_length = len(response['message']['content'])
-        if content_length > 100:
-            base_confidence += 0.1
-        elif content_length < 20:
-            base_confidence -= 0.2
+        # Basic confidence calculation, adjusted by response length
+        confidence = 0.7 + 0.1 * (content_length > 100) - 0.2 * (content_length < 20)
         
         # Adjust based on response time (faster might indicate cached/confident response)
-        eval_duration = response.get("eval_duration", 0)
-        if eval_duration > 0:
-            tokens_per_second = response.get("eval_count", 0) / (eval_duration / 1e9)
-            if tokens_per_second > 50:
-                base_confidence += 0.1
-            elif tokens_per_second < 10:
-                base_confidence -= 0.1
+        if tokens_per_second is not None:
+            confidence += 0.1 * (tokens_per_second > 50) - 0.1 * (tokens_per_second < 10)
         
-        return max(0.0, min(1.0, base_confidence))
+        return max(0.0, min(1.0, confidence))
     
     def _update_performance_metrics(
         self,
@@ -463,26 +700,26 @@ class LocalLLMClient:
         
         metrics = self.performance_metrics[model_name]
         metrics.total_requests += 1
-        metrics.last_used = datetime.now()
+        metrics.last_used_ns = time.time_ns()
         
         if success:
             metrics.successful_requests += 1
+            n = metrics.successful_requests
             
+            # Running means are updated incrementally (avg += (x - avg) / n),
+            # so the totals never have to be rebuilt and rescaled
             if response_time_ms is not None:
                 # Update average response time
-                total_time = metrics.avg_response_time_ms * (metrics.successful_requests - 1)
-                metrics.avg_response_time_ms = (total_time + response_time_ms) / metrics.successful_requests
+                metrics.avg_response_time_ms += (response_time_ms - metrics.avg_response_time_ms) / n
                 
                 # Update tokens per second
                 if tokens_generated and response_time_ms > 0:
                     tokens_per_second = tokens_generated / (response_time_ms / 1000)
-                    total_tps = metrics.avg_tokens_per_second * (metrics.successful_requests - 1)
-                    metrics.avg_tokens_per_second = (total_tps + tokens_per_second) / metrics.successful_requests
+                    metrics.avg_tokens_per_second += (tokens_per_second - metrics.avg_tokens_per_second) / n
             
             if confidence_score is not None:
                 # Update average confidence
-                total_confidence = metrics.avg_confidence_score * (metrics.successful_requests - 1)
-                metrics.avg_confidence_score = (total_confidence + confidence_score) / metrics.successful_requests
+                metrics.avg_confidence_score += (confidence_score - metrics.avg_confidence_score) / n
         else:
             metrics.failed_requests += 1
     
@@ -515,8 +752,8 @@ class LocalLLMClient:
         Returns:
             Model name if found, None otherwise
         """
-        for model_name, model_config in self.models.items():
-            if model_config.role == role and model_config.enabled:
+        for model_name in self._role_index.get(role, ()):
+            if self.models[model_name].enabled:
                 return model_name
         return None
     
@@ -527,22 +764,24 @@ class LocalLLMClient:
         Returns:
             Dictionary containing performance summary
         """
-        summary = {
-            "total_models": len(self.models),
-            "enabled_models": sum(1 for m in self.models.values() if m.enabled),
-            "total_requests": sum(m.total_requests for m in self.performance_metrics.values()),
-            "total_successful": sum(m.successful_requests for m in self.performance_metrics.values()),
-            "overall_success_rate": 0.0,
-            "models": {}
-        }
-        
-        if summary["total_requests"] > 0:
-            summary["overall_success_rate"] = summary["total_successful"] / summary["total_requests"]
+        total_requests = 0
+        total_successful = 0
+        models = {}
         
+        # Aggregate totals and serialize each model's metrics in one pass
         for model_name, metrics in self.performance_metrics.items():
-            summary["models"][model_name] = metrics.to_dict()
+            total_requests += metrics.total_requests
+            total_successful += metrics.successful_requests
+            models[model_name] = metrics.to_dict()
         
-        return summary
+        return {
+            "total_models": len(self.models),
+            "enabled_models": sum(1 for m in self.models.values() if m.enabled),
+            "total_requests": total_requests,
+            "total_successful": total_successful,
+            "overall_success_rate": total_successful / total_requests if total_requests > 0 else 0.0,
+            "models": models
+        }
     
     async def reset_performance_metrics(self, model_name: Optional[str] = None):
         """
@@ -558,6 +797,16 @@ class LocalLLMClient:
             for model_name in self.performance_metrics.keys():
                 self.performance_metrics[model_name] = ModelPerformanceMetrics(model_name)
     
+    async def reset_response_cache(self):
+        """Drop all cached responses."""
+        self._response_cache.clear()
+    
+    async def __aenter__(self) -> "LocalLLMClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.shutdown()
+    
     async def shutdown(self):
         """Gracefully shutdown the client."""
         self.logger.info("Shutting down Local LLM Client")
@@ -569,71 +818,93 @@ class LocalLLMClient:
 
 # Utility functions for model management
 
-async def test_model_connectivity(config: EnhancedConfig) -> Dict[str, Any]:
+DEFAULT_MAX_PARALLEL_MODELS = 8
+
+
+def _max_parallel_models(config: "EnhancedConfig") -> int:
+    """Number of models the utility functions may query at the same time."""
+    return getattr(config, 'max_parallel_models', None) or DEFAULT_MAX_PARALLEL_MODELS
+
+
+async def test_model_connectivity(
+    config: "EnhancedConfig",
+    client: Optional[LocalLLMClient] = None
+) -> Dict[str, Any]:
     """
     Test connectivity to all configured models.
     
     Args:
         config: Enhanced configuration object
+        client: Existing client to reuse, or None to create (and shut down) one
         
     Returns:
         Dictionary containing test results
     """
-    client = LocalLLMClient(config)
-    
-    try:
-        connected = await client.connect()
-        if not connected:
-            return {"success": False, "error": "Failed to connect to Ollama"}
-        
-        health_status = await client.health_check()
-        
-        # Test each model with a simple prompt
-        test_results = {}
-        for model_name in client.models.keys():
-            if client.models[model_name].enabled:
-                try:
-                    response = await client.generate_response(
-                        model_name=model_name,
-                        prompt="Hello, please respond with 'OK' to confirm you're working.",
-                        max_tokens=10
-                    )
-                    test_results[model_name] = {
-                        "success": True,
-                        "response_time_ms": response.response_time_ms,
-                        "tokens_generated": response.tokens_generated
-                    }
-                except Exception as e:
-                    test_results[model_name] = {
+    async with AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(LocalLLMClient(config))
+        
+        try:
+            connected = await client.connect()
+            if not connected:
+                return {"success": False, "error": "Failed to connect to Ollama"}
+            
+            health_status = await client.health_check()
+            
+            # Test each model with a simple prompt, all models at once
+            semaphore = asyncio.Semaphore(_max_parallel_models(config))
+            
+            async def test_model(model_name: str) -> Dict[str, Any]:
+                if not client.models[model_name].enabled:
+                    return {
                         "success": False,
-                        "error": str(e)
+                        "error": "Model not available"
                     }
-            else:
-                test_results[model_name] = {
-                    "success": False,
-                    "error": "Model not available"
-                }
-        
-        return {
-            "success": True,
-            "health_status": health_status,
-            "model_tests": test_results
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-    
-    finally:
-        await client.shutdown()
+                
+                async with semaphore:
+                    try:
+                        response = await client.generate_response(
+                            model_name=model_name,
+                            prompt="Hello, please respond with 'OK' to confirm you're working.",
+                            max_tokens=10
+                        )
+                        return {
+                            "success": True,
+                            "response_time_ms": response.response_time_ms,
+                            "tokens_generated": response.tokens_generated
+                        }
+                    except Exception as e:
+                        return {
+                            "success": False,
+                            "error": str(e)
+                        }
+            
+            model_names = list(client.models.keys())
+            results = await asyncio.gather(*(test_model(name) for name in model_names))
+            test_results = dict(zip(model_names, results))
+            
+            return {
+                "success": True,
+                "health_status": health_status,
+                "model_tests": test_results
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
 
-async def benchmark_models(config: EnhancedConfig, test_prompt: str = None) -> Dict[str, Any]:
+async def benchmark_models(
+    config: "EnhancedConfig",
+    test_prompt: str = None,
+    client: Optional[LocalLLMClient] = None
+) -> Dict[str, Any]:
     """
     Benchmark all available models with a standard prompt.
     
     Args:
         config: Enhanced configuration object
         test_prompt: Custom test prompt, or None for default
+        client: Existing client to reuse, or None to create (and shut down) one
         
     Returns:
         Dictionary containing benchmark results
@@ -644,51 +915,57 @@ async def benchmark_models(config: EnhancedConfig, test_prompt: str = None) -> D
             "Include error handling and documentation."
         )
     
-    client = LocalLLMClient(config)
-    
-    try:
-        connected = await client.connect()
-        if not connected:
-            return {"success": False, "error": "Failed to connect to Ollama"}
+    async with AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(LocalLLMClient(config))
         
-        benchmark_results = {}
-        
-        for model_name in client.models.keys():
-            if client.models[model_name].enabled:
-                try:
-                    response = await client.generate_response(
-                        model_name=model_name,
-                        prompt=test_prompt
-                    )
-                    
-                    benchmark_results[model_name] = {
-                        "success": True,
-                        "response_time_ms": response.response_time_ms,
-                        "tokens_generated": response.tokens_generated,
-                        "confidence_score": response.confidence_score,
-                        "tokens_per_second": response.tokens_generated / (response.response_time_ms / 1000),
-                        "response_length": len(response.content),
-                        "role": response.role.value
-                    }
-                    
-                except Exception as e:
-                    benchmark_results[model_name] = {
-                        "success": False,
-                        "error": str(e)
-                    }
-        
-        return {
-            "success": True,
-            "test_prompt": test_prompt,
-            "results": benchmark_results,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-    
-    finally:
-        await client.shutdown()
+        try:
+            connected = await client.connect()
+            if not connected:
+                return {"success": False, "error": "Failed to connect to Ollama"}
+            
+            semaphore = asyncio.Semaphore(_max_parallel_models(config))
+            
+            async def benchmark_model(model_name: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        response = await client.generate_response(
+                            model_name=model_name,
+                            prompt=test_prompt
+                        )
+                        
+                        return {
+                            "success": True,
+                            "response_time_ms": response.response_time_ms,
+                            "tokens_generated": response.tokens_generated,
+                            "confidence_score": response.confidence_score,
+                            "tokens_per_second": (
+                                response.tokens_generated / (response.response_time_ms / 1000)
+                                if response.response_time_ms > 0 else 0.0
+                            ),
+                            "response_length": len(response.content),
+                            "role": response.role.value
+                        }
+                        
+                    except Exception as e:
+                        return {
+                            "success": False,
+                            "error": str(e)
+                        }
+            
+            model_names = [name for name, model in client.models.items() if model.enabled]
+            results = await asyncio.gather(*(benchmark_model(name) for name in model_names))
+            benchmark_results = dict(zip(model_names, results))
+            
+            return {
+                "success": True,
+                "test_prompt": test_prompt,
+                "results": benchmark_results,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
 
 if __name__ == "__main__":
@@ -699,15 +976,16 @@ if __name__ == "__main__":
     async def main():
         config = EnhancedConfig()
         
-        # Test connectivity
-        print("Testing model connectivity...")
-        test_results = await test_model_connectivity(config)
-        print(json.dumps(test_results, indent=2))
-        
-        # Run benchmark
-        print("\nRunning model benchmark...")
-        benchmark_results = await benchmark_models(config)
-        print(json.dumps(benchmark_results, indent=2))
+        async with LocalLLMClient(config) as client:
+            # Test connectivity
+            print("Testing model connectivity...")
+            test_results = await test_model_connectivity(config, client=client)
+            print(json.dumps(test_results, indent=2))
+            
+            # Run benchmark
+            print("\nRunning model benchmark...")
+            benchmark_results = await benchmark_models(config, client=client)
+            print(json.dumps(benchmark_results, indent=2))
     
     asyncio.run(main())
 